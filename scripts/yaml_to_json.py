@@ -0,0 +1,60 @@
+# scripts/yaml_to_json.py
+"""
+Regenerate the JSON sidecars of the YAML config files.
+
+Each `config/<name>.json` holds the parsed YAML plus the SHA-256 of the YAML
+source. `my_google_api_helpers` uses the sidecar only while that hash matches,
+so a stale sidecar is never read. The YAML stays the source of truth: run this
+after editing it, or `--check` (used by pre-commit) to fail on drift.
+
+    python scripts/yaml_to_json.py                      # default config files
+    python scripts/yaml_to_json.py config/other.yaml    # specific files
+    python scripts/yaml_to_json.py --check              # exit 1 if any is stale
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "config"
+DEFAULT_FILES = [CONFIG_DIR / "google_api_scopes.yaml", CONFIG_DIR / "google_users.yaml"]
+
+
+def source_sha256(yaml_path: Path) -> str:
+    return hashlib.sha256(yaml_path.read_bytes()).hexdigest()
+
+
+def convert(yaml_path: Path) -> Path:
+    import yaml
+    with open(yaml_path) as f:
+        data = yaml.safe_load(f)
+    sidecar = {"source_sha256": source_sha256(yaml_path), "data": data}
+    json_path = yaml_path.with_suffix(".json")
+    json_path.write_text(json.dumps(sidecar, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return json_path
+
+
+def is_current(yaml_path: Path) -> bool:
+    try:
+        sidecar = json.loads(yaml_path.with_suffix(".json").read_bytes())
+    except (FileNotFoundError, ValueError):
+        return False
+    return isinstance(sidecar, dict) and sidecar.get("source_sha256") == source_sha256(yaml_path)
+
+
+def main(argv: list) -> int:
+    check = "--check" in argv
+    paths = [Path(p) for p in argv if p != "--check"] or DEFAULT_FILES
+    if check:
+        stale = [p for p in paths if not is_current(p)]
+        for path in stale:
+            print(f"❌ {path.with_suffix('.json')} is stale; run: python scripts/yaml_to_json.py")
+        return 1 if stale else 0
+    for path in paths:
+        print(f"✅ {path} → {convert(path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
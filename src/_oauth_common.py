@@ -0,0 +1,170 @@
+# _oauth_common.py
+# Helpers shared by my_google_api_helpers.py and youtube_auth.py
+
+import os
+import time
+import logging
+import functools
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# orjson parses token JSON several times faster when installed (optional)
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+logger = logging.getLogger(__name__)
+
+# Normalize Email for Safe Filename
+#
+#   transforms: lgtkgtv@gmail.com → lgtkgtv_at_gmail_dot_com
+#   Used for token file naming `tokens/lgtkgtv_at_gmail_dot_com__gmail__send.json`
+#
+_ACCOUNT_ID_TABLE = str.maketrans({"@": "_at_", ".": "_dot_"})
+
+@functools.lru_cache(maxsize=256)
+def normalize_account_id(account_email: str) -> str:
+    return account_email.translate(_ACCOUNT_ID_TABLE)
+
+# Build API clients from discovery documents shipped in `config/discovery/`
+#
+#   config/discovery/{api}_{version}.json, e.g. youtube_v3.json
+#   (copied from googleapiclient/discovery_cache/documents/youtube.v3.json)
+#
+# Skips googleapiclient's discovery lookup; APIs without a shipped document
+# fall back to `build()` pinned to the documents bundled with the library
+# (`static_discovery=True`: no network fetch) and with the file cache off
+# (`cache_discovery=False`: no probing of ~/.cache/google-api-python-client).
+#
+DISCOVERY_DIR = Path(__file__).resolve().parents[1] / "config" / "discovery"
+
+@functools.lru_cache(maxsize=None)
+def _read_discovery_doc(api_name: str, version: str) -> Optional[str]:
+    try:
+        return (DISCOVERY_DIR / f"{api_name}_{version}.json").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+def build_client(api_name: str, version: str, credentials):
+    doc = _read_discovery_doc(api_name, version)
+    if doc is None:
+        from googleapiclient.discovery import build
+        return build(api_name, version, credentials=credentials,
+                     static_discovery=True, cache_discovery=False)
+    from googleapiclient.discovery import build_from_document
+    return build_from_document(doc, credentials=credentials)
+
+# Save a token file readable by the owner only
+#
+# The token is written to a temp file in the same directory (mkstemp creates it
+# 0o600 at open time) and then os.replace()d over the old one, so an
+# interrupted write never leaves a truncated token behind. The token
+# directory is created 0o700.
+#
+def save_token(token_file, creds) -> None:
+    token_dir = os.path.dirname(token_file) or "."
+    os.makedirs(token_dir, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=token_dir, prefix=".token-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", buffering=8192) as token:
+            token.write(creds.to_json())
+            token.flush()
+            os.fsync(token.fileno())
+        os.replace(tmp_path, token_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# Load → maybe refresh → maybe OAuth consent → save
+#
+#   1. the in-memory credentials for `token_file`, else the token file itself
+#   2. refresh when expired and a refresh token is available
+#   3. otherwise run the consent flow (`run_console()` when headless)
+#   4. save the refreshed/issued token back to `token_file`
+#
+# Credentials are cached per (absolute token file path, scopes): while they
+# are still valid a call returns them without any import or syscall. The path
+# is made absolute (no I/O) so an os.chdir() between calls can't map the same
+# relative path onto a different token; scopes are part of the key because
+# youtube_auth keeps one token file per account for any scope set. The entry
+# is dropped when a refresh fails and replaced whenever a new token is saved.
+#
+_CREDS_CACHE: dict[tuple, object] = {}
+
+def load_or_refresh_creds(token_file, scopes: list, client_secret_file: str, *,
+                          headless: bool = False):
+    cache_key = (os.path.abspath(token_file), tuple(scopes))
+    creds = _CREDS_CACHE.get(cache_key)
+    if creds and creds.valid:
+        return creds
+
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    if creds is None:
+        try:
+            # One read_bytes() + fast parse, instead of from_authorized_user_file()
+            info = _json_loads(Path(token_file).read_bytes())
+            creds = Credentials.from_authorized_user_info(info, scopes)
+        except FileNotFoundError:
+            creds = None
+        except Exception as e:
+            logger.warning(f"Failed to load credentials from {token_file}: {e}")
+            creds = None
+
+    if creds and creds.valid:
+        _CREDS_CACHE[cache_key] = creds
+        return creds
+
+    name = os.path.basename(token_file)
+    if creds and creds.expired and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+            logger.info(f"🔄 Refreshed token: {name}")
+        except Exception as e:
+            logger.warning(f"Token refresh failed for {name}: {e}")
+            _CREDS_CACHE.pop(cache_key, None)
+            creds = None
+
+    if not creds or not creds.valid:
+        logger.info(f"🌐 Starting OAuth flow: {name}")
+        try:
+            flow = InstalledAppFlow.from_client_secrets_file(client_secret_file, scopes)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"❌ Missing client_secret.json at: {client_secret_file}") from None
+        creds = flow.run_console() if headless else flow.run_local_server(port=0)
+
+    save_token(token_file, creds)
+    _CREDS_CACHE[cache_key] = creds
+    logger.info(f"✅ Token saved: {name}")
+    return creds
+
+# Authenticated clients, cached in-process by a caller key (e.g. api + scope
+# profile + account + scopes). A cached client is reused until shortly before
+# its access token expires; the rebuild then starts from the in-memory
+# credentials (see `load_or_refresh_creds`) rather than the token file.
+#
+_CLIENT_CACHE: dict[tuple, tuple[float, object]] = {}
+_EXPIRY_MARGIN_S = 60
+
+def _expiry_ts(creds) -> float:
+    # creds.expiry is a naive UTC datetime; map it onto the monotonic clock
+    if creds.expiry is None:
+        return 0.0
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return time.monotonic() + (creds.expiry - now).total_seconds()
+
+def get_client(cache_key: tuple, api_name: str, version: str, token_file,
+               scopes: list, client_secret_file: str, *, headless: bool = False):
+    cached = _CLIENT_CACHE.get(cache_key)
+    if cached and time.monotonic() < cached[0] - _EXPIRY_MARGIN_S:
+        return cached[1]
+
+    creds = load_or_refresh_creds(token_file, scopes, client_secret_file, headless=headless)
+    client = build_client(api_name, version, creds)
+    _CLIENT_CACHE[cache_key] = (_expiry_ts(creds), client)
+    return client
@@ -1,20 +1,63 @@
 # src/config_loader.py
 
 import os
+import re
+import functools
 from pathlib import Path
-from dotenv import load_dotenv
+
+# Project root is fixed for the process; resolve it once
+_ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
+
+_ENV_LINE = re.compile(r"(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*)")
+_QUOTED_VALUE = re.compile(r"""(?:"((?:\\.|[^"\\])*)"|'([^']*)')\s*(?:#.*)?""")
+_ESCAPES = {"n": "\n", "t": "\t", '"': '"', "\\": "\\"}
+
+def _parse_env(text: str) -> dict:
+    """Minimal .env parser.
+
+    Handles KEY=VALUE lines, an optional `export ` prefix, single/double-quoted
+    values (double quotes honour \\n, \\t, \\" and \\\\) and full-line or trailing
+    `#` comments. Lines without a valid identifier as key are skipped.
+    Unlike load_dotenv(), `${VAR}` references are NOT expanded.
+    """
+    env = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _ENV_LINE.fullmatch(line)
+        if not match:
+            continue
+        key, value = match.groups()
+        quoted = _QUOTED_VALUE.fullmatch(value)
+        if quoted and quoted.group(1) is not None:
+            value = re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(0)), quoted.group(1))
+        elif quoted:
+            value = quoted.group(2)
+        else:
+            value = re.split(r"\s+#", value, maxsplit=1)[0].strip()
+        env[key] = value
+    return env
 
 def load_env(verbose: bool = False):
-    env_path = Path(__file__).resolve().parents[1] / ".env"
+    env_path = _ENV_PATH
     if verbose:
         print(f"env_path=", env_path)
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-        if verbose:
-            print(f"[BOOTSTRAP] Loaded .env from {env_path}")
-    else:
+    try:
+        text = env_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         if verbose:
             print("[BOOTSTRAP] ⚠️ .env file not found")
+        return
+    # Like load_dotenv(): variables already set in the environment win
+    for key, value in _parse_env(text).items():
+        os.environ.setdefault(key, value)
+    get_config.cache_clear()
+    if verbose:
+        print(f"[BOOTSTRAP] Loaded .env from {env_path}")
 
+# Env values are effectively fixed after bootstrap, so lookups are memoized;
+# load_env() clears the cache when it adds variables.
+@functools.lru_cache(maxsize=128)
 def get_config(key: str, default: str = None):
     return os.getenv(key, default)
@@ -3,24 +3,32 @@
 ------------------------------------------------------------------------------
 | Feature                         | Where                                         |
 | ------------------------------- | --------------------------------------------- |
-| Load YAML config                | `load_scope_profiles`, `load_user_api_config` |
+| Load YAML (or JSON sidecar)     | `load_scope_profiles`, `load_user_api_config` |
 | Normalize user ID               | `normalize_account_id`                        |
 | Cache tokens per user+API+scope | `tokens/{user}__{api}__{scope}.json`          |
-| Reuse token if valid            | `Credentials.from_authorized_user_file()`     |
+| Reuse token if valid            | `Credentials.from_authorized_user_info()`     |
 | Refresh token if expired        | `creds.refresh()`                             |
 | Start new OAuth flow if needed  | `flow.run_local_server()`                     |
-| Save refreshed/issued token     | `token.write(creds.to_json())`                |
+| Save refreshed/issued token     | `save_token()` (mode 0o600)                   |
 ------------------------------------------------------------------------------
 """
 
 import os
-import yaml
+import copy
+import json
+import hashlib
 import logging
+import functools
 from pathlib import Path
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+
+try:
+    from ._oauth_common import get_client, normalize_account_id
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from _oauth_common import get_client, normalize_account_id
+
+# yaml and the Google client libraries (see `_oauth_common`) are imported
+# inside the functions that use them: they are heavy, and importing this
+# module should stay cheap.
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -31,13 +39,37 @@ CONFIG_SCOPE_PATH = "config/google_api_scopes.yaml"
 CONFIG_USERS_PATH = "config/google_users.yaml"
 DEFAULT_TOKEN_DIR = "tokens"
 
-# 1. Normalize Email for Safe Filename
+# 1. Normalize Email for Safe Filename -- see `_oauth_common.normalize_account_id`
 #
 #   transforms: lgtkgtv@gmail.com → lgtkgtv_at_gmail_dot_com
-#   Used for token file naming `tokens/lgtkgtv_at_gmail_dot_com__gmail__send.json`
 #
-def normalize_account_id(account_email: str) -> str:
-    return account_email.replace("@", "_at_").replace(".", "_dot_")
+
+# Parsed configs are cached per (resolved path, mtime): repeated loads hit
+# memory, and editing the file invalidates the entry.
+#
+# `config/<name>.json` sidecars (written by `scripts/yaml_to_json.py`) store the
+# SHA-256 of the YAML they were generated from. When it matches the YAML's
+# current bytes, the sidecar is read with the stdlib C JSON parser and yaml is
+# never imported; otherwise the YAML is parsed, preferring libyaml's loader.
+#
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(path_str: str, mtime: float):
+    p = Path(path_str)
+    source = p.read_bytes()
+    try:
+        sidecar = json.loads(p.with_suffix(".json").read_bytes())
+    except (FileNotFoundError, ValueError):  # missing, truncated or conflicted: parse the YAML
+        sidecar = None
+    if isinstance(sidecar, dict) and sidecar.get("source_sha256") == hashlib.sha256(source).hexdigest():
+        return sidecar["data"]
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(source, Loader=loader)
+
+def _load_yaml(yaml_path: str):
+    p = Path(yaml_path).resolve()
+    # Deepcopy so callers can't mutate the cached object
+    return copy.deepcopy(_load_config_cached(str(p), p.stat().st_mtime))
 
 # 2. Load API Scopes configurations for Google's OAUTH2 based APIs
 #
@@ -48,8 +80,7 @@ def normalize_account_id(account_email: str) -> str:
 #    - https://www.googleapis.com/auth/youtube.force-ssl
 #
 def load_scope_profiles(yaml_path: str = CONFIG_SCOPE_PATH) -> dict:
-    with open(yaml_path) as f:
-        return yaml.safe_load(f)
+    return _load_yaml(yaml_path)
 
 # 2. Load API scopes configured per Google users account -- These will be requested by this app
 # - user: lgtkgtv@gmail.com
@@ -57,8 +88,7 @@ def load_scope_profiles(yaml_path: str = CONFIG_SCOPE_PATH) -> dict:
 #    youtube: write
 #
 def load_user_api_config(yaml_path: str = CONFIG_USERS_PATH) -> list:
-    with open(yaml_path) as f:
-        return yaml.safe_load(f)
+    return _load_yaml(yaml_path)
 
 
 # 3. Select Scopes for a Given API + Profile
@@ -74,6 +104,9 @@ def get_scopes_for(api: str, profile: str, scope_config: dict) -> list:
 
 
 # Main function to get authenticated client
+#
+#   Token load/refresh/consent and the client cache live in `_oauth_common`
+#
 def get_google_api_client(api_name: str,
                           scope_profile: str,
                           account_email: str,
@@ -85,37 +118,13 @@ def get_google_api_client(api_name: str,
 
     # Prepare token path
     norm = normalize_account_id(account_email)
-    token_dir = Path(DEFAULT_TOKEN_DIR)
-    token_dir.mkdir(exist_ok=True)
-    token_file = token_dir / f"{norm}__{api_name}__{scope_profile}.json"
-
-    creds = None
-
-    # Load token if exists
-    if token_file.exists():
-        creds = Credentials.from_authorized_user_file(token_file, scopes)
-
-    # Refresh or authenticate
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            logger.info(f"🔄 Refreshed token for {account_email} - {api_name}")
-        else:
-            # Use default or env override
-            client_secret_file = client_secret_file or os.getenv("GOOGLE_CLIENT_SECRET", "secret/client_secret.json")
-            if not Path(client_secret_file).exists():
-                raise FileNotFoundError(f"❌ Missing client_secret.json at: {client_secret_file}")
-            # Launch OAuth Consent Flow
-            logger.info(f"🌐 Starting OAuth flow for {account_email} - {api_name} ({scope_profile})")
-            flow = InstalledAppFlow.from_client_secrets_file(client_secret_file, scopes)
-            creds = flow.run_local_server(port=0)  # Receives access_token + refresh_token
-
-        # Save token for reuse
-        with open(token_file, "w") as token:
-            token.write(creds.to_json())
-            logger.info(f"✅ Token saved: {token_file.name}")
-
-    return build(api_name, "v3", credentials=creds)
+    token_file = Path(DEFAULT_TOKEN_DIR) / f"{norm}__{api_name}__{scope_profile}.json"
+
+    # Use default or env override
+    client_secret_file = client_secret_file or os.getenv("GOOGLE_CLIENT_SECRET", "secret/client_secret.json")
+
+    return get_client((api_name, scope_profile, account_email, tuple(scopes)),
+                      api_name, "v3", token_file, scopes, client_secret_file)
 
 
 ## Token Isolation Per (User, API, Scope)
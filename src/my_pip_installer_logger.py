@@ -1,71 +1,185 @@
-import logging
+import os
+import re
+import sys
 import subprocess
 import json
-from io import StringIO
-from typing import List, Dict
-
-def run_pip_install_summary(packages: List[str]) -> Dict[str, Dict]:
-    """Install pip packages with clean summary and safe repeated use."""
-
-    # In-memory log buffer
-    log_buffer = StringIO()
-
-    # Set up pip logger fresh every time
-    pip_logger = logging.getLogger("pip_logger")
-    pip_logger.setLevel(logging.INFO)
-    pip_logger.propagate = False  # ✅ Prevent Jupyter log echoing
-
-    # Clean up old handlers
-    for handler in pip_logger.handlers[:]:
-        pip_logger.removeHandler(handler)
-
-    # Use buffer logger
-    buffer_handler = logging.StreamHandler(log_buffer)
-    buffer_handler.setFormatter(logging.Formatter('%(message)s'))
-    pip_logger.addHandler(buffer_handler)
+import tempfile
+from collections import deque
+from typing import Deque, List, Dict, Optional, Tuple
+
+# pip of the running interpreter (not whatever `pip` is first on PATH), with the
+# PyPI self-version check and interactive prompts disabled
+_PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--upgrade",
+                "--disable-pip-version-check", "--no-input"]
+
+# Upper bound on captured log lines per call (oldest lines are dropped)
+_MAX_LOG_LINES = 10000
+
+_STATUS_EMOJI = {"success": "✅", "skipped": "⏭️", "failed": "❌"}
+
+def _canonical_name(requirement: str) -> str:
+    """Project name of a requirement, PEP 503-normalized ("Google_Auth>=2" → "google-auth")."""
+    match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", requirement.strip())
+    name = match.group(0) if match else requirement
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+# "name", "name[extra]>=1; marker", "name @ url" -- anything else (./path,
+# git+https://..., archive URLs) doesn't start with the project name
+_NAMED_REQUIREMENT = re.compile(r"\s*[A-Za-z0-9][A-Za-z0-9._-]*\s*(?:\[[^\]]*\])?\s*(?:[@<>=!~;(].*)?")
+
+def _requirement_name(requirement: str) -> Optional[str]:
+    """Canonical project name of a requirement, or None for paths/URLs."""
+    if not _NAMED_REQUIREMENT.fullmatch(requirement):
+        return None
+    return _canonical_name(requirement)
+
+def _report_status(pkg: str, installed) -> str:
+    """Status of a requirement after a successful pip run, from the report's install names."""
+    name = _requirement_name(pkg)
+    if name is None:
+        # Can't map a path/URL onto a report entry by name; pip succeeded, so don't claim "skipped"
+        return "success"
+    return "success" if name in installed else "skipped"
+
+_SATISFIED_PREFIX = "Requirement already satisfied:"
+
+def _already_satisfied(pkg: str, output_lines: List[str]) -> bool:
+    """Whether pip printed "Requirement already satisfied: <pkg> in ..." for pkg itself."""
+    name = _requirement_name(pkg)
+    if name is None:
+        return False
+    return any(
+        line.startswith(_SATISFIED_PREFIX)
+        and _canonical_name(line[len(_SATISFIED_PREFIX):]) == name
+        for line in output_lines
+    )
+
+def _pip_install(args: List[str], timeout: Optional[float]):
+    """Run `python -m pip install --upgrade <args>`; return (returncode, output lines, timed out)."""
+    process = subprocess.Popen(
+        [*_PIP_INSTALL, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1 << 16
+    )
+
+    # communicate() drains the pipe fully, so verbose output can't block pip
+    timed_out = False
+    try:
+        stdout, _ = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, _ = process.communicate()
+        timed_out = True
+
+    return process.returncode, [line.strip() for line in stdout.splitlines()], timed_out
+
+def _pip_install_report(packages: List[str], timeout: Optional[float]):
+    """Run pip with --report; return (returncode, output lines, installed names, timed out).
+
+    Installed names are PEP 503-normalized, or None when pip wrote no report
+    (the run failed, or pip is too old for --report).
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = os.path.join(tmp_dir, "report.json")
+        returncode, output_lines, timed_out = _pip_install(["--report", report_path, *packages], timeout)
+        try:
+            with open(report_path, "rb") as f:
+                report = json.load(f)
+        except FileNotFoundError:
+            return returncode, output_lines, None, timed_out
+
+    installed = {_canonical_name(item["metadata"]["name"]) for item in report.get("install", [])}
+    return returncode, output_lines, installed, timed_out
+
+def _install_batch(packages: List[str], log_lines: Optional[Deque[str]], timeout):
+    """Install all packages in one pip run, reading statuses from pip's JSON report.
+
+    Returns (results, report_supported). results is None when the batch can't
+    be attributed per package: pip is too old for --report, or the run failed
+    (one bad package aborts the whole resolution, so the caller retries
+    package by package). A batch that hit the timeout is not retried: every
+    package is reported "failed", since a killed run may have left any of
+    them half-installed and retrying would cost another timeout each.
+    """
+    returncode, output_lines, installed, timed_out = _pip_install_report(packages, timeout)
+    if log_lines is not None:
+        log_lines.append(f"📦 Installing: {' '.join(packages)}")
+        log_lines.extend(output_lines)
+    if timed_out:
+        return {pkg: {"status": "failed", "messages": output_lines} for pkg in packages}, True
+    if returncode != 0 or installed is None:
+        report_supported = not any("no such option: --report" in line for line in output_lines)
+        return None, report_supported
+
+    # Requested packages missing from the report's install list were already up to date
+    return {
+        pkg: {
+            "status": _report_status(pkg, installed),
+            "messages": output_lines
+        }
+        for pkg in packages
+    }, True
 
+def _install_each(packages: List[str], log_lines: Optional[Deque[str]], timeout,
+                  use_report: bool = True) -> Dict[str, Dict]:
+    """Fallback: one pip run per package, so failures are attributed individually."""
     results = {}
 
     for pkg in packages:
-        pip_logger.info(f"📦 Installing: {pkg}")
-        process = subprocess.Popen(
-            ["pip", "install", "--upgrade", pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
-        )
-
-        output_lines = []
-        already_satisfied = False
-
-        for line in process.stdout:
-            clean_line = line.strip()
-            output_lines.append(clean_line)
-            pip_logger.info(clean_line)
-            if clean_line.startswith("Requirement already satisfied:"):
-                already_satisfied = True
-
-        process.wait()
-
-        if already_satisfied:
-            status = "skipped"
-        elif process.returncode == 0:
-            status = "success"
+        if use_report:
+            returncode, output_lines, installed, _ = _pip_install_report([pkg], timeout)
         else:
+            returncode, output_lines, _ = _pip_install([pkg], timeout)
+            installed = None
+        if log_lines is not None:
+            log_lines.append(f"📦 Installing: {pkg}")
+            log_lines.extend(output_lines)
+
+        if returncode != 0:
             status = "failed"
+        elif installed is not None:
+            # The report says whether anything was installed; no output scan needed
+            status = _report_status(pkg, installed)
+        else:
+            # Old pip without --report: skipped only if the requested package itself
+            # (not one of its dependencies) was reported as already satisfied
+            status = "skipped" if _already_satisfied(pkg, output_lines) else "success"
 
         results[pkg] = {
             "status": status,
             "messages": output_lines
         }
 
-    # 📌 Print clean summary
-    for pkg, info in results.items():
-        emoji = {"success": "✅", "skipped": "⏭️", "failed": "❌"}[info["status"]]
-        print(f"{emoji} {pkg} → {info['status']}")
+    return results
+
+def run_pip_install_summary(packages: List[str],
+                            timeout: Optional[float] = None,
+                            capture_logs: bool = False) -> Tuple[Dict[str, Dict], str]:
+    """Install pip packages with clean summary and safe repeated use.
+
+    Returns (results, logs); logs is the raw pip output when capture_logs=True,
+    otherwise an empty string.
+    """
+
+    # Fresh, bounded in-memory log buffer per call (only when requested)
+    log_lines = deque(maxlen=_MAX_LOG_LINES) if capture_logs else None
+
+    # One resolver run for the whole list; per-package only if that can't be attributed
+    results, use_report = _install_batch(packages, log_lines, timeout) if packages else ({}, True)
+    if results is None:
+        results = _install_each(packages, log_lines, timeout, use_report)
+
+    # 📌 Print clean summary (one write to the notebook/TTY stream)
+    sys.stdout.write("".join(
+        f"{_STATUS_EMOJI[info['status']]} {pkg} → {info['status']}\n"
+        for pkg, info in results.items()
+    ))
 
     # Return both result and captured logs in case needed
-    return results, log_buffer.getvalue()
+    return results, "\n".join(log_lines) if log_lines is not None else ""
 
 
 
@@ -73,15 +187,15 @@ def run_pip_install_summary(packages: List[str]) -> Dict[str, Dict]:
 Example Usage
 
 packages = ["google-auth", "nonexistent-package"]
-results, logs = run_pip_install_summary(packages)
+results, logs = run_pip_install_summary(packages, capture_logs=True)
 print(logs) # if in case want to display logs
 
 
 # 🧠 Why This Is Better for Jupyter
 | Concern                   | Addressed                                 |
 | ------------------------- | ----------------------------------------- |
-| Duplicate logger handlers | ✅ Removed every time function runs        |
-| Log buffer memory growth  | ✅ Re-initialized per call                 |
+| Jupyter log echoing       | ✅ No logger involved; logs are opt-in     |
+| Log buffer memory growth  | ✅ Bounded deque, re-initialized per call  |
 | Reentrancy / reusability  | ✅ Safe to run in same notebook many times |
 
 